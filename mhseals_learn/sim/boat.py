@@ -1,9 +1,11 @@
 import pygame
 import numpy as np
 from time import time
-from typing import Union
+from typing import Union, Optional
 from mhseals_learn.sim.utils import numeric, generate_rectangle
 from mhseals_learn.sim.gui import Drawable
+from mhseals_learn.sim.camera import Camera
+from mhseals_learn.sim.spatial import SpatialGrid
 from mhseals_learn.sim.constants import Constants as C
 
 C.to_px()
@@ -49,15 +51,50 @@ class Boat(Drawable):
         self.dt = current_time - self.time
         self.time = current_time        
 
-    def move(self):
-        self.update_delta_time()
+    def move(self, dt: Optional[numeric]=None):
+        # A fixed dt steps the boat deterministically instead of by wall clock time
+        if dt is None:
+            self.update_delta_time()
+        else:
+            self.dt = dt
         self.x += np.cos(self.orientation) * self.linear_velocity * self.dt
         self.y += np.sin(self.orientation) * self.linear_velocity * self.dt
         self.orientation += self.angular_velocity * self.dt
 
-    def draw(self, screen: pygame.Surface):
-        points = generate_rectangle(self.x, self.y, self.orientation, self.length, self.width, self.translate_draw_point, screen)
+    def draw(self, screen: pygame.Surface, camera: Optional[Camera]=None):
+        points = generate_rectangle(self.x, self.y, self.orientation, self.length, self.width, self.translate_draw_point, screen, camera=camera)
         points.append(self.translate_draw_point((self.x + np.cos(self.orientation) * self.length * 0.8, 
                                                  self.y + np.sin(self.orientation) * self.length * 0.8
-                                              ), screen))
-        pygame.draw.polygon(screen, pygame.Color(self.color), points)
\ No newline at end of file
+                                              ), screen, camera))
+        pygame.draw.polygon(screen, pygame.Color(self.color), points)
+
+class Trail(Drawable):
+    def __init__(self, spacing: numeric=C.Trail.SPACING, color: Union[str, pygame.Color]="#1f1f1f"):
+        self.spacing = spacing
+        self.color = color
+        self.last = None
+        self.grid = SpatialGrid(C.Trail.CELL_SIZE)
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    def append(self, x: numeric, y: numeric):
+        # Only keep points that are far enough apart, a slow boat would otherwise add one per frame
+        if self.last is not None and (x - self.last[0]) ** 2 + (y - self.last[1]) ** 2 < self.spacing ** 2:
+            return
+        self.last = (x, y)
+        self.grid.insert(None, x, y)
+
+    def draw(self, screen: pygame.Surface, camera: Optional[Camera]=None):
+        radius = max(1, C.Trail.RADIUS * (camera.scale if camera else 1))
+        if camera is None:
+            points = ((x, y) for bucket in self.grid.cells.values() for x, y, _ in bucket)
+        else:
+            # The cull margin is in world units: C.Trail.RADIUS, or more when
+            # zoomed out far enough that dots are clamped to a screen pixel
+            margin = radius / camera.scale
+            points = ((x, y) for x, y, _ in self.grid.query(*camera.expanded_view(margin)))
+
+        color = pygame.Color(self.color)
+        for point in points:
+            pygame.draw.circle(screen, color, self.translate_draw_point(point, screen, camera), radius)
\ No newline at end of file
@@ -0,0 +1,67 @@
+from typing import Tuple
+from mhseals_learn.sim.utils import numeric
+from mhseals_learn.sim.constants import Constants as C
+
+
+class Camera:
+    """
+    World to screen transform with zoom, pan and optional target following.
+
+    `update` must be called once per frame; it caches the scale, offsets and
+    visible world rectangle so `to_screen` is a multiply-add per point. With
+    the defaults it reproduces the fixed transform of
+    `Drawable.translate_draw_point` (world origin at the screen center).
+    """
+
+    def __init__(
+        self,
+        screen_width: int,
+        screen_height: int,
+        x: numeric=0,
+        y: numeric=0,
+        zoom: numeric=1.0,
+        target=None
+    ):
+        self.width = screen_width
+        self.height = screen_height
+        self.x = x
+        self.y = y
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+        self.zoom = zoom
+        self.target = target
+        self.update()
+
+    def pan(self, dx: numeric, dy: numeric):
+        """Shift the view by (dx, dy) screen pixels."""
+        self.pan_x += dx / self.zoom
+        self.pan_y -= dy / self.zoom
+
+    def reset_pan(self):
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+
+    def zoom_by(self, factor: numeric):
+        self.zoom = max(C.Camera.ZOOM_MIN, min(C.Camera.ZOOM_MAX, self.zoom * factor))
+
+    def update(self):
+        if self.target is not None:
+            self.x = self.target.x
+            self.y = self.target.y
+
+        center_x = self.x + self.pan_x
+        center_y = self.y + self.pan_y
+        half_width = self.width / 2 / self.zoom
+        half_height = self.height / 2 / self.zoom
+
+        self.scale = self.zoom
+        self.offset_x = self.width / 2 - center_x * self.zoom
+        self.offset_y = self.height / 2 + center_y * self.zoom
+        self.view = (center_x - half_width, center_y - half_height, center_x + half_width, center_y + half_height)
+
+    def to_screen(self, point: Tuple[numeric, numeric]) -> Tuple[numeric, numeric]:
+        return (self.offset_x + point[0] * self.scale, self.offset_y - point[1] * self.scale)
+
+    def expanded_view(self, margin: numeric=0) -> Tuple[numeric, numeric, numeric, numeric]:
+        x_min, y_min, x_max, y_max = self.view
+        return (x_min - margin, y_min - margin, x_max + margin, y_max + margin)
@@ -45,6 +45,46 @@ class Constants:
         DPS_MAX = Meters(5.0)
         APS_MAX = Degrees(10.0)
         _BASE = {k: v for k, v in locals().items() if isinstance(v, (Meters, Degrees))}
+
+    class Trail:
+        SPACING = Meters(0.25)
+        RADIUS = Meters(0.05)
+        CELL_SIZE = Meters(5.0)
+        _BASE = {k: v for k, v in locals().items() if isinstance(v, (Meters, Degrees))}
+
+    class Map:
+        CELL_SIZE = Meters(5.0)
+        _BASE = {k: v for k, v in locals().items() if isinstance(v, (Meters, Degrees))}
+
+    class Camera:
+        ZOOM_MIN: numeric = 0.1
+        ZOOM_MAX: numeric = 10.0
+
+    class Lidar:
+        RAYS: int = 360
+        FOV = Degrees(360.0)
+        MAX_RANGE = Meters(30.0)
+        RANGE_NOISE = Meters(0.02)
+        DROPOUT: numeric = 0.01
+        RATE: numeric = 10
+        _BASE = {k: v for k, v in locals().items() if isinstance(v, (Meters, Degrees))}
+
+    class Detector:
+        FOV = Degrees(90.0)
+        MAX_RANGE = Meters(25.0)
+        RANGE_NOISE = Meters(0.2)
+        BEARING_NOISE = Degrees(1.0)
+        DROPOUT: numeric = 0.05
+        _BASE = {k: v for k, v in locals().items() if isinstance(v, (Meters, Degrees))}
+
+    class Env:
+        GATES: int = 3
+        LOOKAHEAD: int = 2
+        DT: numeric = 0.1
+        MAX_STEPS: int = 1000
+        GATE_REWARD: numeric = 1.0
+        COLLISION_REWARD: numeric = -1.0
+        PROGRESS_REWARD: numeric = 0.01
     
     @classmethod
     def convert_all(cls, factor: float, unit_from: type, unit_to: type):
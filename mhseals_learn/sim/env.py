@@ -0,0 +1,389 @@
+import os
+import multiprocessing as mp
+import numpy as np
+from enum import Enum
+from random import Random
+from typing import Dict, List, Optional, Tuple, Union
+from mhseals_learn.sim.boat import Boat
+from mhseals_learn.sim.map import Course
+from mhseals_learn.sim.sensors import Lidar
+from mhseals_learn.sim.constants import Constants as C
+
+try:
+    from gymnasium import spaces
+    from gymnasium.vector import AutoresetMode, VectorEnv
+except ImportError:
+    spaces = None
+    VectorEnv = object
+
+    class AutoresetMode(Enum):
+        """Stand-in for gymnasium.vector.AutoresetMode with the same values."""
+        NEXT_STEP = "NextStep"
+        SAME_STEP = "SameStep"
+        DISABLED = "Disabled"
+
+C.to_px()
+C.to_rad()
+
+StepResult = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]
+Seed = Optional[Union[int, List[Optional[int]]]]
+
+
+def _seeds(seed: Seed, num_envs: int) -> List[Optional[int]]:
+    # Same rules as Gymnasium's vector envs: an int seeds environment i with
+    # seed + i, a list gives every environment its own seed (None keeps its
+    # current stream)
+    if seed is None:
+        return [None] * num_envs
+    if isinstance(seed, (int, np.integer)):
+        return [int(seed) + i for i in range(num_envs)]
+    seeds = list(seed)
+    if len(seeds) != num_envs:
+        raise ValueError(f"expected {num_envs} seeds, got {len(seeds)}")
+    return seeds
+
+
+def _masked_infos(values: Dict[str, np.ndarray], mask: np.ndarray) -> Dict[str, np.ndarray]:
+    # Gymnasium's info layout: every key has a `_key` mask of the environments
+    # it applies to and is zero for the others
+    infos = {}
+    for key, value in values.items():
+        infos[key] = np.where(mask, value, np.zeros_like(value))
+        infos[f"_{key}"] = mask.copy()
+    return infos
+
+
+class BoatVecEnv(VectorEnv):
+    """
+    N boats, each on its own random gate course, stepped together with NumPy.
+
+    A Gymnasium `VectorEnv` when gymnasium is installed: `reset` returns
+    (obs, infos) and `step` returns (obs, rewards, terminated, truncated,
+    infos), all batched over the first axis. Every info key has a `_key`
+    mask of the environments it applies to.
+
+    Actions are (N, 2) in [-1, 1], scaled to `C.Boat.DPS_MAX` and
+    `C.Boat.APS_MAX` for linear and angular velocity. Observations are the
+    positions of the four buoys of the next `lookahead` gates in the boat's
+    frame (meters, x forward), followed by the normalized velocities. With a
+    `lidar`, its ranges scaled to [0, 1] by its max range are appended.
+
+    A boat is rewarded for closing in on the exit of its next gate and for
+    passing through it, and is terminated when it hits a buoy or clears its
+    whole course. `autoreset_mode` works like Gymnasium's: with `NEXT_STEP`
+    (the default, which Gymnasium's vector wrappers expect) a finished
+    environment is reset by the following `step`, which ignores its action
+    and returns its first observation with no reward. With `SAME_STEP` it is
+    reset inside the `step` it finished on: as in Gymnasium,
+    `infos["final_obs"]` is an object array holding the observation it
+    finished on (None for the others) and `infos["final_info"]` holds the
+    infos it finished with, while the top-level infos belong to the new
+    episode. With `DISABLED` it keeps stepping until `reset`.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        gates: int=C.Env.GATES,
+        lookahead: int=C.Env.LOOKAHEAD,
+        dt: float=C.Env.DT,
+        max_steps: int=C.Env.MAX_STEPS,
+        autoreset_mode: Union[str, AutoresetMode]=AutoresetMode.NEXT_STEP,
+        lidar: Optional[Lidar]=None
+    ):
+        self.num_envs = num_envs
+        self.gates = gates
+        self.lookahead = lookahead
+        self.dt = dt
+        self.max_steps = max_steps
+        self.autoreset_mode = AutoresetMode(autoreset_mode)
+        self.metadata = {"autoreset_mode": self.autoreset_mode}
+        self.closed = False
+        self.lidar = lidar
+        self.state_dim = lookahead * 4 * 2 + 2
+        self.observation_dim = self.state_dim + (lidar.rays if lidar else 0)
+
+        # Boat state
+        self.pos = np.zeros((num_envs, 2))
+        self.theta = np.zeros(num_envs)
+        self.v = np.zeros(num_envs)
+        self.w = np.zeros(num_envs)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.needs_reset = np.zeros(num_envs, dtype=bool)
+
+        # Course state
+        self.courses: List[Optional[Course]] = [None] * num_envs
+        self.centers = np.zeros((num_envs, gates, 2))
+        self.orientations = np.zeros((num_envs, gates))
+        self.half_heights = np.zeros((num_envs, gates))
+        self.half_widths = np.zeros((num_envs, gates))
+        self.buoys = np.zeros((num_envs, gates, 4, 2))
+        self.next_gate = np.zeros(num_envs, dtype=np.int64)
+        self.target_dist = np.zeros(num_envs)
+
+        self.rngs = [Random() for _ in range(num_envs)]
+        self.noise_rngs = [np.random.default_rng() for _ in range(num_envs)]
+        self._rows = np.arange(num_envs)
+
+        if spaces is not None:
+            self.single_observation_space = spaces.Box(-np.inf, np.inf, (self.observation_dim,), np.float32)
+            self.single_action_space = spaces.Box(-1.0, 1.0, (2,), np.float32)
+            self.observation_space = spaces.Box(-np.inf, np.inf, (num_envs, self.observation_dim), np.float32)
+            self.action_space = spaces.Box(-1.0, 1.0, (num_envs, 2), np.float32)
+
+    def reset(self, seed: Seed=None, options: Optional[dict]=None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        # Each environment's seed drives both its courses and its sensor noise,
+        # so a shard handed the same seeds reproduces both
+        for i, env_seed in enumerate(_seeds(seed, self.num_envs)):
+            if env_seed is not None:
+                self.rngs[i].seed(env_seed)
+                self.noise_rngs[i] = np.random.default_rng(env_seed)
+
+        self._reset_envs(self._rows)
+        self.needs_reset[:] = False
+        return self._observe(), {}
+
+    def step(self, actions: np.ndarray) -> StepResult:
+        actions = np.clip(np.asarray(actions, dtype=float).reshape(self.num_envs, 2), -1.0, 1.0)
+        self.v = actions[:, 0] * C.Boat.DPS_MAX
+        self.w = actions[:, 1] * C.Boat.APS_MAX
+
+        # Same kinematics as Boat.move
+        prev = self.pos.copy()
+        self.pos[:, 0] += np.cos(self.theta) * self.v * self.dt
+        self.pos[:, 1] += np.sin(self.theta) * self.v * self.dt
+        self.theta += self.w * self.dt
+        self.steps += 1
+
+        passed = self._passed_gate(prev)
+        dist = self._target_distance()
+        rewards = C.Env.PROGRESS_REWARD * (self.target_dist - dist) / C.Conversions.METERS2PX
+        rewards[passed] += C.Env.GATE_REWARD
+
+        # Passing a gate moves the target, so progress restarts from the new one
+        self.next_gate += passed
+        self.target_dist = np.where(passed, self._target_distance(), dist)
+
+        collided = self._collided()
+        rewards[collided] += C.Env.COLLISION_REWARD
+
+        success = self.next_gate >= self.gates
+        terminated = collided | success
+        truncated = (self.steps >= self.max_steps) & ~terminated
+        stepped = np.ones(self.num_envs, dtype=bool)
+
+        # Environments that finished on the last step start over instead,
+        # their action is ignored and they report nothing but the new episode
+        if self.autoreset_mode == AutoresetMode.NEXT_STEP and self.needs_reset.any():
+            indices = np.flatnonzero(self.needs_reset)
+            self._reset_envs(indices)
+            rewards[indices] = 0
+            terminated[indices] = False
+            truncated[indices] = False
+            stepped = ~self.needs_reset
+
+        obs = self._observe()
+        values = {"gates_passed": self.next_gate.copy(), "collision": collided, "is_success": success}
+        infos = _masked_infos(values, stepped)
+
+        done = terminated | truncated
+        if self.autoreset_mode == AutoresetMode.NEXT_STEP:
+            self.needs_reset = done
+        if self.autoreset_mode == AutoresetMode.SAME_STEP and done.any():
+            indices = np.flatnonzero(done)
+            final_obs = np.full(self.num_envs, None, dtype=object)
+            for i in indices:
+                final_obs[i] = obs[i].copy()
+
+            # The new episodes haven't reported anything yet
+            infos = _masked_infos(values, ~done)
+            infos["final_obs"] = final_obs
+            infos["_final_obs"] = done
+            infos["final_info"] = _masked_infos(values, done)
+            infos["_final_info"] = done.copy()
+
+            self._reset_envs(indices)
+            obs[indices] = self._observe(indices)
+
+        return obs, rewards, terminated, truncated, infos
+
+    def close(self, **kwargs):
+        self.closed = True
+
+    def _reset_envs(self, indices: np.ndarray):
+        for i in indices:
+            boat = Boat(C.Boat.LENGTH, C.Boat.WIDTH, orientation=C.Boat.START_ORIENTATION)
+            course = Course.random(boat, self.gates, self.rngs[i])
+            self.courses[i] = course
+            for g, gate in enumerate(course.gates):
+                self.centers[i, g] = (gate.x, gate.y)
+                self.orientations[i, g] = gate.orientation
+                self.half_heights[i, g] = gate.height / 2
+                self.half_widths[i, g] = gate.width / 2
+                self.buoys[i, g] = [(buoy.x, buoy.y) for buoy in gate.buoys]
+
+            self.pos[i] = (boat.x, boat.y)
+            self.theta[i] = boat.orientation
+
+        self.v[indices] = 0
+        self.w[indices] = 0
+        self.steps[indices] = 0
+        self.next_gate[indices] = 0
+        self.target_dist[indices] = self._target_distance()[indices]
+
+    def _current_gate(self) -> np.ndarray:
+        return np.minimum(self.next_gate, self.gates - 1)
+
+    def _target_distance(self) -> np.ndarray:
+        g = self._current_gate()
+        orientation = self.orientations[self._rows, g]
+        target = self.centers[self._rows, g] + self.half_heights[self._rows, g, None] * np.stack((np.cos(orientation), np.sin(orientation)), axis=1)
+        return np.linalg.norm(target - self.pos, axis=1)
+
+    def _passed_gate(self, prev: np.ndarray) -> np.ndarray:
+        # A gate is passed by crossing its exit line between the two rows of buoys
+        g = self._current_gate()
+        center = self.centers[self._rows, g]
+        cos = np.cos(self.orientations[self._rows, g])
+        sin = np.sin(self.orientations[self._rows, g])
+        half_height = self.half_heights[self._rows, g]
+
+        rel_prev = prev - center
+        rel = self.pos - center
+        along_prev = rel_prev[:, 0] * cos + rel_prev[:, 1] * sin
+        along = rel[:, 0] * cos + rel[:, 1] * sin
+        across = -rel[:, 0] * sin + rel[:, 1] * cos
+
+        return ((self.next_gate < self.gates)
+                & (along_prev <= half_height)
+                & (along > half_height)
+                & (np.abs(across) < self.half_widths[self._rows, g]))
+
+    def _collided(self) -> np.ndarray:
+        radius = C.Buoy.RADIUS + C.Boat.WIDTH / 2
+        rel = self.buoys.reshape(self.num_envs, -1, 2) - self.pos[:, None, :]
+        return (rel ** 2).sum(axis=2).min(axis=1) < radius ** 2
+
+    def _observe(self, rows: Optional[np.ndarray]=None) -> np.ndarray:
+        rows = self._rows if rows is None else rows
+        pos = self.pos[rows]
+        theta = self.theta[rows]
+
+        g = np.minimum(self.next_gate[rows, None] + np.arange(self.lookahead), self.gates - 1)
+        rel = self.buoys[rows[:, None], g] - pos[:, None, None, :]
+        cos = np.cos(theta)[:, None, None]
+        sin = np.sin(theta)[:, None, None]
+        local = np.stack((cos * rel[..., 0] + sin * rel[..., 1], -sin * rel[..., 0] + cos * rel[..., 1]), axis=-1)
+
+        obs = np.empty((len(rows), self.observation_dim), dtype=np.float32)
+        obs[:, :self.state_dim - 2] = local.reshape(len(rows), -1) / C.Conversions.METERS2PX
+        obs[:, self.state_dim - 2] = self.v[rows] / C.Boat.DPS_MAX
+        obs[:, self.state_dim - 1] = self.w[rows] / C.Boat.APS_MAX
+
+        if self.lidar is not None:
+            max_range = self.lidar.max_range * C.Conversions.PX2METERS
+            poses = np.column_stack((pos, theta))
+            grids = [self.courses[i].grid for i in rows]
+            ranges = self.lidar.scan(poses, grids, [self.noise_rngs[i] for i in rows])
+            obs[:, self.state_dim:] = np.minimum(ranges, max_range) / max_range
+        return obs
+
+
+def _worker(remote, parent_remote, num_envs: int, kwargs: dict):
+    parent_remote.close()
+    env = BoatVecEnv(num_envs, **kwargs)
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == "step":
+                remote.send(env.step(data))
+            elif command == "reset":
+                remote.send(env.reset(seed=data))
+            elif command == "close":
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        env.close()
+        remote.close()
+
+
+class SubprocVecEnv(VectorEnv):
+    """
+    Shards `num_envs` environments across worker processes, each running a
+    `BoatVecEnv` over its slice. Results are concatenated so it can be used
+    in place of a single `BoatVecEnv`; the same seed gives the same courses.
+    """
+
+    def __init__(self, num_envs: int, num_workers: Optional[int]=None, start_method: Optional[str]=None, **kwargs):
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        self.num_envs = num_envs
+        self.sizes = [len(shard) for shard in np.array_split(np.arange(num_envs), num_workers)]
+        self.offsets = np.cumsum([0] + self.sizes[:-1])
+        self.autoreset_mode = AutoresetMode(kwargs.get("autoreset_mode", AutoresetMode.NEXT_STEP))
+        self.metadata = {"autoreset_mode": self.autoreset_mode}
+        self.closed = False
+
+        ctx = mp.get_context(start_method)
+        self.remotes = []
+        self.processes = []
+        for size in self.sizes:
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(work_remote, remote, size, kwargs), daemon=True)
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        # Spaces and observation size come from a throwaway single shard
+        template = BoatVecEnv(1, **kwargs)
+        self.observation_dim = template.observation_dim
+        if spaces is not None:
+            self.single_observation_space = template.single_observation_space
+            self.single_action_space = template.single_action_space
+            self.observation_space = spaces.Box(-np.inf, np.inf, (num_envs, self.observation_dim), np.float32)
+            self.action_space = spaces.Box(-1.0, 1.0, (num_envs, 2), np.float32)
+
+    def reset(self, seed: Seed=None, options: Optional[dict]=None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        seeds = _seeds(seed, self.num_envs)
+        for remote, offset, size in zip(self.remotes, self.offsets, self.sizes):
+            remote.send(("reset", seeds[offset:offset + size]))
+        results = [remote.recv() for remote in self.remotes]
+        obs, infos = zip(*results)
+        return np.concatenate(obs), self._merge_infos(infos)
+
+    def step(self, actions: np.ndarray) -> StepResult:
+        actions = np.asarray(actions).reshape(self.num_envs, 2)
+        for remote, offset, size in zip(self.remotes, self.offsets, self.sizes):
+            remote.send(("step", actions[offset:offset + size]))
+        results = [remote.recv() for remote in self.remotes]
+        obs, rewards, terminated, truncated, infos = zip(*results)
+        return (np.concatenate(obs), np.concatenate(rewards), np.concatenate(terminated),
+                np.concatenate(truncated), self._merge_infos(infos))
+
+    def close(self, **kwargs):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def _merge_infos(self, infos: Tuple[Dict[str, np.ndarray], ...]) -> Dict[str, np.ndarray]:
+        # A key only some shards reported (e.g. final_obs) is filled in the way
+        # BoatVecEnv fills it: None in object arrays, zeros otherwise, and
+        # nested infos like final_info are merged the same way
+        merged = {}
+        keys = dict.fromkeys(key for info in infos for key in info)
+        for key in keys:
+            template = next(info[key] for info in infos if key in info)
+            if isinstance(template, dict):
+                merged[key] = self._merge_infos(tuple(info.get(key, {}) for info in infos))
+                continue
+            blank = None if template.dtype == object else 0
+            merged[key] = np.concatenate([
+                info[key] if key in info else np.full((size,) + template.shape[1:], blank, dtype=template.dtype)
+                for info, size in zip(infos, self.sizes)
+            ])
+        return merged
@@ -1,16 +1,22 @@
 import pygame
 import numpy as np
 from time import time
-from typing import Tuple, List, Union
+from typing import Tuple, List, Union, Optional, TYPE_CHECKING
 from abc import ABC, abstractmethod
 from mhseals_learn.sim.utils import numeric
+from mhseals_learn.sim.camera import Camera
+
+if TYPE_CHECKING:
+    from mhseals_learn.sim.recorder import FrameWriter
 
 class Drawable(ABC):
     @abstractmethod
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: pygame.Surface, camera: Optional[Camera]=None):
         pass
 
-    def translate_draw_point(self, point: Tuple[numeric, numeric], screen) -> Tuple[numeric, numeric]:
+    def translate_draw_point(self, point: Tuple[numeric, numeric], screen, camera: Optional[Camera]=None) -> Tuple[numeric, numeric]:
+        if camera is not None:
+            return camera.to_screen(point)
         width, height = screen.get_size()
         return (point[0] + width / 2, height / 2 - point[1])
 
@@ -37,4 +43,56 @@ class GUI:
         return pygame.event.get()
         
     def quit(self):
-        pygame.quit()
\ No newline at end of file
+        pygame.quit()
+
+
+class OffscreenGUI(GUI):
+    """GUI that renders into a NumPy RGB buffer instead of a window."""
+
+    def __init__(self, screen_width: int, screen_height: int):
+        pygame.init()
+        self.width = screen_width
+        self.height = screen_height
+        self.writers: List["FrameWriter"] = []
+
+        # The surface shares memory with the buffer, so drawing on the screen
+        # writes straight into the array and frames never have to be copied out
+        self.buffer = np.zeros((screen_height, screen_width, 3), dtype=np.uint8)
+        self.screen = pygame.image.frombuffer(self.buffer, (screen_width, screen_height), "RGB")
+
+    def frame(self) -> np.ndarray:
+        """Return a (height, width, 3) view of the current frame (not a copy)."""
+        return self.buffer
+
+    def record(self, writer: "FrameWriter"):
+        self.writers.append(writer)
+
+    def update(self):
+        # One failing writer shouldn't starve the others of frames
+        errors = []
+        for writer in self.writers:
+            try:
+                writer.write(self.buffer)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def get_events(self) -> List[pygame.event.Event]:
+        return []
+
+    def quit(self):
+        # Close every writer even if one fails, otherwise the frames still
+        # queued on the others are lost with their threads
+        writers, self.writers = self.writers, []
+        errors = []
+        try:
+            for writer in writers:
+                try:
+                    writer.close()
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            pygame.quit()
+        if errors:
+            raise errors[0]
@@ -1,10 +1,16 @@
+import pygame
+from typing import List, Optional, Tuple
 from mhseals_learn.sim.boat import Boat
-from mhseals_learn.sim.buoy import PoleBuoy
+from mhseals_learn.sim.buoy import Buoy, PoleBuoy
+from mhseals_learn.sim.gui import Drawable
+from mhseals_learn.sim.camera import Camera
+from mhseals_learn.sim.spatial import SpatialGrid
 from mhseals_learn.sim.enums import BuoyColors
 from mhseals_learn.sim.utils import numeric, generate_rectangle
 from mhseals_learn.sim.constants import Constants as C
 import numpy as np
 import random
+from random import Random
 
 C.to_px()
 C.to_rad()
@@ -24,15 +30,60 @@ class Gate:
         for i in range(4):
             self.buoys.append(PoleBuoy(*points[i], colors[i]))
             
+    @property
+    def exit(self) -> Tuple[numeric, numeric]:
+        return (self.x + np.cos(self.orientation) * self.height / 2,
+                self.y + np.sin(self.orientation) * self.height / 2)
+
+    def crossed(self, start: Tuple[numeric, numeric], end: Tuple[numeric, numeric]) -> bool:
+        # Passed when moving out through the exit line between the two rows of buoys
+        cos, sin = np.cos(self.orientation), np.sin(self.orientation)
+        along_start = (start[0] - self.x) * cos + (start[1] - self.y) * sin
+        along_end = (end[0] - self.x) * cos + (end[1] - self.y) * sin
+        across_end = -(end[0] - self.x) * sin + (end[1] - self.y) * cos
+        return along_start <= self.height / 2 < along_end and abs(across_end) < self.width / 2
+
     @classmethod
-    def random(cls, boat: Boat):
-        width = random.uniform(C.Gate.WIDTH_MIN, C.Gate.WIDTH_MAX)
-        height = random.uniform(C.Gate.HEIGHT_MIN, C.Gate.HEIGHT_MAX)
-        dist = random.uniform(C.Gate.GAP_MIN, C.Gate.GAP_MAX) + height / 2
-        angle = random.uniform(-C.Gate.ANGLE_DEV_MAX, C.Gate.ANGLE_DEV_MAX)
-        x = boat.x + (dist * np.cos(angle))
-        y = boat.y + (dist * np.sin(angle)) 
-        orientation = random.uniform(0.0, C.Gate.ORIENTATION_DEV_MULTIPLIER_MAX) * angle
+    def random(cls, boat: Boat, rng: Optional[Random]=None):
+        return cls.random_at(boat.x, boat.y, rng=rng)
+
+    @classmethod
+    def random_at(cls, x: numeric, y: numeric, heading: numeric=0, rng: Optional[Random]=None):
+        rng = rng or random
+        width = rng.uniform(C.Gate.WIDTH_MIN, C.Gate.WIDTH_MAX)
+        height = rng.uniform(C.Gate.HEIGHT_MIN, C.Gate.HEIGHT_MAX)
+        dist = rng.uniform(C.Gate.GAP_MIN, C.Gate.GAP_MAX) + height / 2
+        angle = rng.uniform(-C.Gate.ANGLE_DEV_MAX, C.Gate.ANGLE_DEV_MAX)
+        gate_x = x + (dist * np.cos(heading + angle))
+        gate_y = y + (dist * np.sin(heading + angle))
+        orientation = heading + rng.uniform(0.0, C.Gate.ORIENTATION_DEV_MULTIPLIER_MAX) * angle
         
-        return cls(x, y, orientation, width, height)
-        
\ No newline at end of file
+        return cls(gate_x, gate_y, orientation, width, height)
+
+class Course(Drawable):
+    def __init__(self, gates: List[Gate]):
+        self.gates = gates
+        self.buoys = [buoy for gate in gates for buoy in gate.buoys]
+        self.grid = SpatialGrid(C.Map.CELL_SIZE)
+        for buoy in self.buoys:
+            self.grid.insert(buoy, buoy.x, buoy.y)
+
+    @classmethod
+    def random(cls, boat: Boat, count: int, rng: Optional[Random]=None):
+        # Each gate starts where the previous one ends, heading the way it points
+        gates = [Gate.random(boat, rng)]
+        for _ in range(count - 1):
+            gates.append(Gate.random_at(*gates[-1].exit, gates[-1].orientation, rng))
+        return cls(gates)
+
+    def clearance(self, x: numeric, y: numeric) -> numeric:
+        """Distance from (x, y) to the edge of the closest buoy."""
+        return min(np.hypot(buoy.x - x, buoy.y - y) for buoy in self.buoys) - C.Buoy.RADIUS
+
+    def visible_buoys(self, camera: Camera) -> List[Buoy]:
+        return [buoy for _, _, buoy in self.grid.query(*camera.expanded_view(C.Buoy.RADIUS))]
+
+    def draw(self, screen: pygame.Surface, camera: Optional[Camera]=None):
+        buoys = self.buoys if camera is None else self.visible_buoys(camera)
+        for buoy in buoys:
+            buoy.draw(screen, camera)
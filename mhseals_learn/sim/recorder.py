@@ -0,0 +1,127 @@
+import os
+import queue
+import subprocess
+import threading
+import numpy as np
+import pygame
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class FrameWriter(ABC):
+    """
+    Streams RGB frames to disk on a background thread so encoding never
+    blocks the simulation loop.
+
+    Frames are copied once when queued because the offscreen buffer is reused
+    for the next frame. When `drop_frames` is set, frames are discarded
+    instead of blocking the caller while the queue is full.
+    """
+
+    def __init__(self, max_queue: int = 64, drop_frames: bool = False):
+        self.drop_frames = drop_frames
+        self.dropped = 0
+        self.count = 0
+        self.error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, frame: np.ndarray):
+        if self.error is not None:
+            raise RuntimeError("frame writer failed") from self.error
+
+        frame = np.array(frame, dtype=np.uint8, copy=True)
+        if self.drop_frames:
+            try:
+                self._queue.put_nowait(frame)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self._queue.put(frame)
+
+    def close(self):
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._finish()
+        if self.error is not None:
+            raise RuntimeError("frame writer failed") from self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self._write(frame)
+                self.count += 1
+            except BaseException as e:
+                self.error = e
+
+    @abstractmethod
+    def _write(self, frame: np.ndarray):
+        pass
+
+    def _finish(self):
+        pass
+
+
+class ImageSequenceWriter(FrameWriter):
+    """Writes each frame as a numbered image, e.g. frames/frame_000042.png."""
+
+    def __init__(self, directory: str, pattern: str = "frame_{:06d}.png", **kwargs):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.pattern = pattern
+        super().__init__(**kwargs)
+
+    def _write(self, frame: np.ndarray):
+        height, width, _ = frame.shape
+        surface = pygame.image.frombuffer(frame, (width, height), "RGB")
+        pygame.image.save(surface, os.path.join(self.directory, self.pattern.format(self.count)))
+
+
+class PipeWriter(FrameWriter):
+    """Pipes raw RGB24 frames into the stdin of an encoder process."""
+
+    def __init__(self, command: List[str], **kwargs):
+        self.command = command
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        super().__init__(**kwargs)
+
+    @classmethod
+    def ffmpeg(cls, path: str, width: int, height: int, fps: int = 30, **kwargs):
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-pix_fmt", "yuv420p", path
+        ]
+        return cls(command, **kwargs)
+
+    def _write(self, frame: np.ndarray):
+        self.process.stdin.write(frame.data)
+
+    def _finish(self):
+        # A broken pipe only means the encoder already exited, so always reap
+        # it and report its exit status, which says why
+        broken = None
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError as e:
+            broken = e
+        code = self.process.wait()
+        if code != 0 and (self.error is None or isinstance(self.error, BrokenPipeError)):
+            self.error = subprocess.CalledProcessError(code, self.command)
+        elif self.error is None:
+            self.error = broken
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import queue
+import shlex
+import signal
+import argparse
+import tempfile
+import subprocess
+from time import time
+from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Highest domain ID that maps to valid ports with the default DDS settings
+ROS_DOMAIN_ID_MAX = 101
+# Time allowed for the sim and controller processes to start on top of --timeout
+STARTUP_TIME = 30.0
+STOP_TIME = 5.0
+
+
+def stop(process: subprocess.Popen):
+    # Processes run in their own session so `ros2 run` wrappers take their children down with them
+    if process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGINT)
+        process.wait(STOP_TIME)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def run_scenario(
+    seed: int,
+    domain_id: int,
+    controller: str,
+    gates: int,
+    timeout: float,
+    rate: float,
+    logs: Optional[str]=None
+) -> dict:
+    """Run one seeded course against the controller in its own ROS domain."""
+    env = dict(
+        os.environ,
+        ROS_DOMAIN_ID=str(domain_id),
+        ROS_LOCALHOST_ONLY="1",
+        ROS_AUTOMATIC_DISCOVERY_RANGE="LOCALHOST",
+        SDL_VIDEODRIVER="dummy",
+        SDL_AUDIODRIVER="dummy",
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, "report.json")
+        sim_command = [
+            sys.executable, "-m", "mhseals_learn.sim.sim",
+            "--headless",
+            "--seed", str(seed),
+            "--gates", str(gates),
+            "--timeout", str(timeout),
+            "--rate", str(rate),
+            "--report", report,
+        ]
+
+        outputs = []
+        for name in ("sim", "controller"):
+            if logs:
+                outputs.append(open(os.path.join(logs, f"seed_{seed}_{name}.log"), "w"))
+            else:
+                outputs.append(subprocess.DEVNULL)
+
+        start = time()
+        sim = subprocess.Popen(sim_command, env=env, stdout=outputs[0], stderr=subprocess.STDOUT, start_new_session=True)
+        control = subprocess.Popen(shlex.split(controller), env=env, stdout=outputs[1], stderr=subprocess.STDOUT, start_new_session=True)
+        try:
+            sim.wait(STARTUP_TIME + timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        finally:
+            stop(control)
+            stop(sim)
+            for output in outputs:
+                if output is not subprocess.DEVNULL:
+                    output.close()
+
+        # The sim reports even when it is stopped early (outcome "interrupted"),
+        # so no report means it crashed
+        if os.path.exists(report):
+            with open(report) as f:
+                result = json.load(f)
+        else:
+            result = {"outcome": "no_result", "passed": False, "time": None,
+                      "gates_passed": 0, "gates": gates, "min_clearance": None}
+
+    result.update(seed=seed, domain_id=domain_id, wall_time=time() - start)
+    return result
+
+
+def run_all(seeds: List[int], jobs: int, domain_base: int, **kwargs) -> List[dict]:
+    # Each running scenario borrows a domain ID so concurrent runs never see each other
+    domains = queue.Queue()
+    for domain_id in range(domain_base, domain_base + jobs):
+        domains.put(domain_id)
+
+    def run(seed: int) -> dict:
+        domain_id = domains.get()
+        try:
+            result = run_scenario(seed, domain_id, **kwargs)
+        finally:
+            domains.put(domain_id)
+        print(format_result(result), flush=True)
+        return result
+
+    with ThreadPoolExecutor(jobs) as executor:
+        return list(executor.map(run, seeds))
+
+
+def format_result(result: dict) -> str:
+    time_ = "-" if result["time"] is None else f"{result['time']:.1f}s"
+    clearance = "-" if result["min_clearance"] is None else f"{result['min_clearance']:.2f}m"
+    return (f"seed {result['seed']:>5}  {result['outcome']:<11} time {time_:>7}  "
+            f"gates {result['gates_passed']}/{result['gates']}  clearance {clearance:>6}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Run a /cmd_vel controller against many seeded headless sims in parallel")
+    parser.add_argument("controller", help="command that starts the controller under test, e.g. \"ros2 run my_pkg controller\"")
+    parser.add_argument("--scenarios", type=int, default=20, help="number of seeded courses to run")
+    parser.add_argument("--seed-start", type=int, default=0, help="first seed, scenarios use consecutive seeds")
+    parser.add_argument("--gates", type=int, default=3, help="number of gates in each course")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds each run gets to finish its course")
+    parser.add_argument("--rate", type=float, default=100.0, help="steps per second for each sim, each advancing a fixed 1 / rate of sim time")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="scenarios to run at the same time")
+    parser.add_argument("--domain-base", type=int, default=1, help="first ROS domain ID to use")
+    parser.add_argument("--output", default="regression_report.json", help="where to write the JSON report")
+    parser.add_argument("--logs", help="directory to keep sim and controller output in")
+    options = parser.parse_args(args)
+
+    jobs = max(1, min(options.jobs, options.scenarios))
+    if options.domain_base < 0 or options.domain_base + jobs - 1 > ROS_DOMAIN_ID_MAX:
+        parser.error(f"--domain-base {options.domain_base} with {jobs} jobs needs domain IDs above {ROS_DOMAIN_ID_MAX}")
+    if options.logs:
+        os.makedirs(options.logs, exist_ok=True)
+
+    seeds = list(range(options.seed_start, options.seed_start + options.scenarios))
+    start = time()
+    results = run_all(
+        seeds, jobs, options.domain_base,
+        controller=options.controller,
+        gates=options.gates,
+        timeout=options.timeout,
+        rate=options.rate,
+        logs=options.logs,
+    )
+
+    passed = sum(result["passed"] for result in results)
+    report = {
+        "controller": options.controller,
+        "gates": options.gates,
+        "timeout": options.timeout,
+        "scenarios": len(results),
+        "passed": passed,
+        "failed": len(results) - passed,
+        "wall_time": time() - start,
+        "results": results,
+    }
+    with open(options.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{passed}/{len(results)} scenarios passed in {report['wall_time']:.1f}s, report written to {options.output}")
+    sys.exit(0 if passed == len(results) else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import numpy as np
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+from mhseals_learn.sim.boat import Boat
+from mhseals_learn.sim.buoy import Buoy
+from mhseals_learn.sim.spatial import SpatialGrid
+from mhseals_learn.sim.constants import Constants as C
+
+C.to_px()
+C.to_rad()
+
+Grids = Union[SpatialGrid, Sequence[SpatialGrid]]
+
+
+class Detections(NamedTuple):
+    ranges: np.ndarray
+    bearings: np.ndarray
+    visible: np.ndarray
+    buoys: List[List[Buoy]]
+
+
+def boat_poses(boats: Sequence[Boat]) -> np.ndarray:
+    return np.array([(boat.x, boat.y, boat.orientation) for boat in boats], dtype=float).reshape(-1, 3)
+
+
+def gather_buoys(grids: Grids, origins: np.ndarray, reach: float) -> Tuple[np.ndarray, np.ndarray, List[List[Buoy]]]:
+    """
+    Collect the buoys within `reach` of each origin from the spatial grid(s).
+
+    `grids` is one grid shared by every origin or one grid per origin.
+    Returns (B, K, 2) centers padded to the largest count, a (B, K) mask of
+    which entries are real and the buoys themselves.
+    """
+    buoys = []
+    for i, (x, y) in enumerate(origins):
+        grid = grids if isinstance(grids, SpatialGrid) else grids[i]
+        buoys.append([
+            (bx, by, item) for bx, by, item in grid.query(x - reach, y - reach, x + reach, y + reach)
+            if (bx - x) ** 2 + (by - y) ** 2 <= reach ** 2
+        ])
+
+    k = max(1, max((len(found) for found in buoys), default=0))
+    centers = np.zeros((len(origins), k, 2))
+    valid = np.zeros((len(origins), k), dtype=bool)
+    for i, found in enumerate(buoys):
+        if found:
+            centers[i, :len(found)] = [(bx, by) for bx, by, _ in found]
+            valid[i, :len(found)] = True
+
+    return centers, valid, [[item for _, _, item in found] for found in buoys]
+
+
+def cast_rays(
+    origins: np.ndarray,
+    angles: np.ndarray,
+    centers: np.ndarray,
+    valid: np.ndarray,
+    radius: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intersect (B, R) rays with (B, K) circles in one pass.
+
+    Returns the distance to the first hit along each ray (inf on a miss) and
+    the index of the circle that was hit (-1 on a miss).
+    """
+    directions = np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+    offsets = centers - origins[:, None, :]
+
+    # Projection of each circle center onto each ray, and the squared
+    # distance from the center to the ray
+    along = directions @ offsets.transpose(0, 2, 1)
+    miss_sq = (offsets ** 2).sum(axis=-1)[:, None, :] - along ** 2
+    t = along - np.sqrt(np.maximum(radius ** 2 - miss_sq, 0.0))
+
+    hit = valid[:, None, :] & (miss_sq <= radius ** 2) & (t >= 0)
+    t = np.where(hit, t, np.inf)
+
+    index = t.argmin(axis=-1)
+    dist = np.take_along_axis(t, index[..., None], axis=-1)[..., 0]
+    return dist, np.where(np.isfinite(dist), index, -1)
+
+
+class Lidar:
+    """
+    Planar range sensor that casts `rays` evenly across `fov` around the boat
+    heading against the buoys. Ranges are in meters, inf where a ray hits
+    nothing within `max_range` or drops out.
+
+    A buoy only spans a few degrees, so rather than testing every ray against
+    every buoy only the rays inside each buoy's angular window are tested.
+    """
+
+    def __init__(
+        self,
+        rays: int=C.Lidar.RAYS,
+        fov: float=C.Lidar.FOV,
+        max_range: float=C.Lidar.MAX_RANGE,
+        range_noise: float=C.Lidar.RANGE_NOISE,
+        dropout: float=C.Lidar.DROPOUT,
+        seed: Optional[int]=None
+    ):
+        self.rays = rays
+        self.fov = fov
+        self.max_range = max_range
+        self.range_noise = range_noise
+        self.dropout = dropout
+        self.rng = np.random.default_rng(seed)
+
+        # A full circle doesn't repeat its first ray at the end
+        self.full_circle = fov >= 2 * np.pi - 1e-9
+        self.increment = fov / (rays if self.full_circle else max(rays - 1, 1))
+        self.offsets = -fov / 2 + np.arange(rays) * self.increment
+
+    def scan(self, poses: np.ndarray, grids: Grids, rngs: Optional[Sequence[np.random.Generator]]=None) -> np.ndarray:
+        """
+        Scan from each (x, y, heading) pose. Noise comes from the sensor's own
+        generator, or from `rngs`, one per pose, to give each pose its own
+        reproducible stream.
+        """
+        poses = np.asarray(poses, dtype=float).reshape(-1, 3)
+        origins = poses[:, :2]
+        radius = C.Buoy.RADIUS
+        centers, valid, _ = gather_buoys(grids, origins, self.max_range + radius)
+
+        boat, candidate = np.nonzero(valid)
+        offsets = centers[boat, candidate] - origins[boat]
+        dist = np.hypot(offsets[:, 0], offsets[:, 1])
+
+        # Angle of each buoy measured from the first ray, in [0, 2pi)
+        start = (np.arctan2(offsets[:, 1], offsets[:, 0]) - poses[boat, 2] - self.offsets[0]) % (2 * np.pi)
+        half_width = np.arcsin(np.clip(radius / np.maximum(dist, 1e-9), 0.0, 1.0))
+
+        # A window can run past either end of [0, 2pi), so it is also tried a
+        # full turn earlier and later, which wraps it onto the rays at the seam
+        window = np.tile(np.arange(len(boat)), 3)
+        start = np.concatenate((start, start - 2 * np.pi, start + 2 * np.pi))
+        half_width = np.tile(half_width, 3)
+
+        # Expand each buoy into the rays that fall inside its angular window
+        first = np.ceil((start - half_width) / self.increment).astype(np.int64)
+        last = np.floor((start + half_width) / self.increment).astype(np.int64)
+        counts = np.maximum(np.minimum(last, self.rays - 1) - np.maximum(first, 0) + 1, 0)
+        first = np.maximum(first, 0)
+        pair = np.repeat(window, counts)
+        ray = np.repeat(first, counts) + np.arange(len(pair)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        angles = poses[boat[pair], 2] + self.offsets[ray]
+        along = np.cos(angles) * offsets[pair, 0] + np.sin(angles) * offsets[pair, 1]
+        miss_sq = dist[pair] ** 2 - along ** 2
+        t = along - np.sqrt(np.maximum(radius ** 2 - miss_sq, 0.0))
+        hit = (miss_sq <= radius ** 2) & (t >= 0)
+
+        ranges = np.full((len(poses), self.rays), np.inf)
+        np.minimum.at(ranges, (boat[pair[hit]], ray[hit]), t[hit])
+
+        if self.range_noise:
+            noise = self._sample(rngs, len(poses), lambda rng, shape: rng.normal(0.0, self.range_noise, shape))
+            ranges = np.maximum(ranges + noise, 0.0)
+        ranges[ranges > self.max_range] = np.inf
+        if self.dropout:
+            ranges[self._sample(rngs, len(poses), lambda rng, shape: rng.random(shape)) < self.dropout] = np.inf
+
+        return ranges * C.Conversions.PX2METERS
+
+    def _sample(self, rngs: Optional[Sequence[np.random.Generator]], rows: int, draw) -> np.ndarray:
+        if rngs is None:
+            return draw(self.rng, (rows, self.rays))
+        return np.array([draw(rng, self.rays) for rng in rngs]).reshape(rows, self.rays)
+
+
+class Detector:
+    """
+    Camera-like buoy detector. Reports the range (meters) and bearing
+    (radians, counterclockwise from the heading) of every buoy inside the
+    field of view that is not hidden behind another buoy.
+    """
+
+    def __init__(
+        self,
+        fov: float=C.Detector.FOV,
+        max_range: float=C.Detector.MAX_RANGE,
+        range_noise: float=C.Detector.RANGE_NOISE,
+        bearing_noise: float=C.Detector.BEARING_NOISE,
+        dropout: float=C.Detector.DROPOUT,
+        seed: Optional[int]=None
+    ):
+        self.fov = fov
+        self.max_range = max_range
+        self.range_noise = range_noise
+        self.bearing_noise = bearing_noise
+        self.dropout = dropout
+        self.rng = np.random.default_rng(seed)
+
+    def detect(self, poses: np.ndarray, grids: Grids) -> Detections:
+        poses = np.asarray(poses, dtype=float).reshape(-1, 3)
+        origins = poses[:, :2]
+        centers, valid, buoys = gather_buoys(grids, origins, self.max_range)
+
+        offsets = centers - origins[:, None, :]
+        ranges = np.hypot(offsets[..., 0], offsets[..., 1])
+        bearings = (np.arctan2(offsets[..., 1], offsets[..., 0]) - poses[:, 2:3] + np.pi) % (2 * np.pi) - np.pi
+        in_view = valid & (np.abs(bearings) <= self.fov / 2) & (ranges <= self.max_range)
+
+        # A buoy is occluded if the ray towards its center hits another one first
+        _, index = cast_rays(origins, poses[:, 2:3] + bearings, centers, valid, C.Buoy.RADIUS)
+        visible = in_view & (index == np.arange(centers.shape[1]))
+        if self.dropout:
+            visible &= self.rng.random(visible.shape) >= self.dropout
+
+        if self.range_noise:
+            ranges = ranges + self.rng.normal(0.0, self.range_noise, ranges.shape)
+        if self.bearing_noise:
+            bearings = bearings + self.rng.normal(0.0, self.bearing_noise, bearings.shape)
+
+        return Detections(ranges * C.Conversions.PX2METERS, bearings, visible, buoys)
@@ -1,26 +1,67 @@
 #!/usr/bin/env python3
 
+import json
+import argparse
 import pygame
 import numpy as np
-from mhseals_learn.sim.boat import Boat
+from time import time
+from random import Random
+from typing import Optional
+from mhseals_learn.sim.boat import Boat, Trail
 from mhseals_learn.sim.buoy import BallBuoy, PoleBuoy
 from mhseals_learn.sim.enums import BuoyColors
-from mhseals_learn.sim.gui import GUI
-from mhseals_learn.sim.map import Gate
+from mhseals_learn.sim.gui import GUI, OffscreenGUI
+from mhseals_learn.sim.camera import Camera
+from mhseals_learn.sim.map import Course
+from mhseals_learn.sim.sensors import Lidar, boat_poses
 from mhseals_learn.sim.constants import Constants as C
 import rclpy
 from rclpy.node import Node
+from rclpy.time import Time
+from rclpy.task import Future
+from rclpy.executors import ExternalShutdownException
+from rclpy.utilities import remove_ros_args
 from geometry_msgs.msg import Twist
+from sensor_msgs.msg import LaserScan
+from rosgraph_msgs.msg import Clock
 
 C.to_px()
 C.to_rad()
 
 
 class BoatControl(Node):
-    def __init__(self, boat: Boat, gui: GUI, gate: Gate):
+    def __init__(
+        self,
+        boat: Boat,
+        gui: GUI,
+        course: Course,
+        headless: bool=False,
+        timeout: Optional[float]=None,
+        report: Optional[str]=None,
+        rate: float=0,
+        lidar: Optional[Lidar]=None
+    ):
         self.boat = boat
         self.gui = gui
-        self.gate = gate
+        self.course = course
+        self.lidar = lidar or Lidar()
+        self.camera = Camera(gui.width, gui.height, target=boat)
+        self.trail = Trail()
+
+        # With a rate the sim steps a fixed dt and keeps its own clock, so a
+        # seed reproduces the run instead of depending on timer jitter
+        self.step_dt = 1 / rate if rate > 0 else None
+        self.sim_time = 0.0
+
+        # Run tracking, the clock starts with the first /cmd_vel message
+        self.headless = headless
+        self.timeout = timeout
+        self.report = report
+        self.start_time = None
+        self.next_gate = 0
+        self.min_clearance = float("inf")
+        self.result = None
+        self.done = Future()
 
         super().__init__('boat_control')
         self.subscription = self.create_subscription(
@@ -29,41 +70,134 @@ class BoatControl(Node):
             self.control_callback,
             10
         )
-        self.timer = self.create_timer(0, self.timer_callback)
+        self.timer = self.create_timer(1 / rate if rate > 0 else 0, self.timer_callback)
+        self.scan_publisher = self.create_publisher(LaserScan, '/scan', 10)
+        self.clock_publisher = self.create_publisher(Clock, '/clock', 10) if self.step_dt else None
+        self.scan_timer = self.create_timer(1 / C.Lidar.RATE, self.scan_callback)
 
     def timer_callback(self):
         for event in self.gui.get_events():
             if event.type == pygame.QUIT:
-                running = False
+                self.done.set_result(self.result)
+            elif event.type == pygame.MOUSEWHEEL:
+                self.camera.zoom_by(1.1 ** event.y)
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+                self.camera.pan(-event.rel[0], -event.rel[1])
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_c:
+                self.camera.reset_pan()
     
-        self.boat.set_linear_velocity(5 * C.Conversions.METERS2PX)
-        self.boat.set_angular_velocity(0)
-        self.boat.move()
+        start = (self.boat.x, self.boat.y)
+        self.boat.move(self.step_dt)
+        if self.step_dt:
+            self.sim_time += self.step_dt
+            self.clock_publisher.publish(Clock(clock=self.stamp()))
+        self.trail.append(self.boat.x, self.boat.y)
+
+        if self.start_time is not None and self.result is None:
+            self.update_progress(start)
+
+        # Nobody is watching a headless run, so don't spend time drawing it
+        if self.headless:
+            return
     
         self.gui.clear("#b2d8d8")
+        self.camera.update()
         
-        for buoy in self.gate.buoys:
-            buoy.draw(self.gui.screen)
-        self.boat.draw(self.gui.screen)
+        self.course.draw(self.gui.screen, self.camera)
+        self.trail.draw(self.gui.screen, self.camera)
+        self.boat.draw(self.gui.screen, self.camera)
     
         self.gui.update()
 
+    def now(self) -> float:
+        return self.sim_time if self.step_dt else time()
+
+    def stamp(self):
+        if self.step_dt:
+            return Time(nanoseconds=int(self.sim_time * 1e9)).to_msg()
+        return self.get_clock().now().to_msg()
+
+    def scan_callback(self):
+        ranges = self.lidar.scan(boat_poses([self.boat]), self.course.grid)[0]
+
+        msg = LaserScan()
+        msg.header.stamp = self.stamp()
+        msg.header.frame_id = "base_link"
+        msg.angle_min = float(self.lidar.offsets[0])
+        msg.angle_max = float(self.lidar.offsets[-1])
+        msg.angle_increment = float(self.lidar.increment)
+        msg.range_min = 0.0
+        msg.range_max = float(self.lidar.max_range * C.Conversions.PX2METERS)
+        msg.ranges = ranges.tolist()
+        self.scan_publisher.publish(msg)
+
+    def update_progress(self, start):
+        end = (self.boat.x, self.boat.y)
+        if self.next_gate < len(self.course.gates) and self.course.gates[self.next_gate].crossed(start, end):
+            self.next_gate += 1
+
+        clearance = self.course.clearance(*end) - self.boat.width / 2
+        self.min_clearance = min(self.min_clearance, clearance)
+
+        if clearance < 0:
+            self.finish("collision")
+        elif self.next_gate == len(self.course.gates):
+            self.finish("passed")
+        elif self.timeout is not None and self.now() - self.start_time >= self.timeout:
+            self.finish("timeout")
+
+    def finish(self, outcome: str):
+        self.result = {
+            "outcome": outcome,
+            "passed": outcome == "passed",
+            "time": None if self.start_time is None else self.now() - self.start_time,
+            "gates_passed": self.next_gate,
+            "gates": len(self.course.gates),
+            "min_clearance": None if self.min_clearance == float("inf") else float(self.min_clearance * C.Conversions.PX2METERS),
+        }
+        self.get_logger().info(f"Run finished: {self.result}")
+
+        if self.report:
+            with open(self.report, "w") as f:
+                json.dump(self.result, f)
+            self.done.set_result(self.result)
+
     def control_callback(self, msg):
+        if self.start_time is None:
+            self.start_time = self.now()
+
+        # Twist is in m/s, the boat moves in pixels
         self.boat.set_angular_velocity(msg.angular.z)    
-        self.boat.set_linear_velocity(msg.linear.x)
+        self.boat.set_linear_velocity(msg.linear.x * C.Conversions.METERS2PX)
 
 def main(args=None):
     rclpy.init(args=args)
 
-    gui = GUI(1200, 800)
+    parser = argparse.ArgumentParser(description="Boat simulator driven by /cmd_vel")
+    parser.add_argument("--headless", action="store_true", help="render offscreen and skip drawing")
+    parser.add_argument("--seed", type=int, help="seed for the course, random if not given")
+    parser.add_argument("--gates", type=int, default=1, help="number of gates in the course")
+    parser.add_argument("--timeout", type=float, help="seconds (sim time with --rate) after the first /cmd_vel before the run times out")
+    parser.add_argument("--report", help="write the result of the run to this JSON file and exit")
+    parser.add_argument("--rate", type=float, default=0, help="steps per second, each advancing a fixed 1 / rate and published on /clock; 0 steps by wall time as fast as possible")
+    options = parser.parse_args(remove_ros_args(args)[1:])
+
+    gui = OffscreenGUI(1200, 800) if options.headless else GUI(1200, 800)
     boat = Boat(length=C.Boat.LENGTH, width=C.Boat.WIDTH, x=-gui.width/3, y=0, orientation=C.Boat.START_ORIENTATION, color="#1f1f1f")
-    gate = Gate.random(boat)
-    boat_control = BoatControl(boat, gui, gate)
+    course = Course.random(boat, options.gates, Random(options.seed))
+    lidar = Lidar(seed=options.seed)
+    boat_control = BoatControl(boat, gui, course, options.headless, options.timeout, options.report, options.rate, lidar)
 
-    rclpy.spin(boat_control)
+    try:
+        rclpy.spin_until_future_complete(boat_control, boat_control.done)
+    except (KeyboardInterrupt, ExternalShutdownException):
+        # Stopped from outside, e.g. by sim_regression's wall-clock deadline
+        # on a loaded machine, so report the progress made so far
+        if boat_control.result is None:
+            boat_control.finish("interrupted")
 
     boat_control.destroy_node()
-    rclpy.shutdown()
+    rclpy.try_shutdown()
     gui.quit()
 
 if __name__ == '__main__':
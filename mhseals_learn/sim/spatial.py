@@ -0,0 +1,48 @@
+import numpy as np
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+from mhseals_learn.sim.utils import numeric
+
+
+class SpatialGrid:
+    """
+    Uniform grid hash for points in world coordinates.
+
+    Queries only visit the cells overlapping the requested rectangle, so
+    their cost depends on how much is inside it rather than on how many
+    points were inserted.
+    """
+
+    def __init__(self, cell_size: numeric):
+        self.cell_size = float(cell_size)
+        self.cells: Dict[Tuple[int, int], List[Tuple[numeric, numeric, Any]]] = defaultdict(list)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def cell(self, x: numeric, y: numeric) -> Tuple[int, int]:
+        return (int(np.floor(x / self.cell_size)), int(np.floor(y / self.cell_size)))
+
+    def insert(self, item: Any, x: numeric, y: numeric):
+        self.cells[self.cell(x, y)].append((x, y, item))
+        self.count += 1
+
+    def query(self, x_min: numeric, y_min: numeric, x_max: numeric, y_max: numeric) -> Iterator[Tuple[numeric, numeric, Any]]:
+        """Yield (x, y, item) for every point inside the rectangle."""
+        cx_min, cy_min = self.cell(x_min, y_min)
+        cx_max, cy_max = self.cell(x_max, y_max)
+
+        # Walk whichever is smaller: the covered cells or the occupied ones
+        if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > len(self.cells):
+            keys = [k for k in self.cells if cx_min <= k[0] <= cx_max and cy_min <= k[1] <= cy_max]
+        else:
+            keys = [(i, j) for i in range(cx_min, cx_max + 1) for j in range(cy_min, cy_max + 1)]
+
+        for key in keys:
+            bucket = self.cells.get(key)
+            if not bucket:
+                continue
+            for x, y, item in bucket:
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    yield x, y, item
@@ -25,12 +25,13 @@ setup(
     author="Liam Bray",
     description="Roboboat teaching/learning package",
     license="GNU GPLv3",
-    tests_require=["pytest"],
+    tests_require=["pytest", "pytest-benchmark"],
     entry_points={
         "console_scripts": [
             "basic_subscriber = mhseals_learn.lessons.ros.basic_subscriber:main",
             "basic_publisher = mhseals_learn.lessons.ros.basic_publisher:main",
-            "sim = mhseals_learn.sim.sim:main"
+            "sim = mhseals_learn.sim.sim:main",
+            "sim_regression = mhseals_learn.sim.regression:main"
         ],
     },
 )
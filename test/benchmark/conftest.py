@@ -0,0 +1,84 @@
+import os
+
+# Must be set before pygame is imported so no window is ever opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import random  # noqa: E402
+from glob import glob  # noqa: E402
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+from pytest_benchmark.utils import get_machine_id  # noqa: E402
+from mhseals_learn.sim.boat import Boat  # noqa: E402
+from mhseals_learn.sim.gui import GUI, OffscreenGUI  # noqa: E402
+from mhseals_learn.sim.constants import Constants as C  # noqa: E402
+
+C.to_px()
+C.to_rad()
+
+SEED = 32
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 800
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # pytest.ini always compares, which is a usage error until this machine
+    # has a baseline, and recording a new baseline shouldn't fail against the
+    # old one. pytest-benchmark only looks in the folder for its own machine
+    # id, which changes with the OS, Python version and architecture.
+    storage = config.getoption("benchmark_storage", None)
+    if storage is None:
+        return
+    path = storage[len("file://"):] if storage.startswith("file://") else storage
+    folder = os.path.join(path, get_machine_id())
+    has_baseline = bool(glob(os.path.join(folder, "*.json")))
+    if config.getoption("benchmark_save") or not has_baseline:
+        config.option.benchmark_compare = []
+        config.option.benchmark_compare_fail = None
+    if not has_baseline:
+        config.benchmark_baseline_missing = folder
+
+
+def pytest_report_header(config):
+    folder = getattr(config, "benchmark_baseline_missing", None)
+    if folder is not None:
+        return f"benchmark: no baseline in {folder}, regressions are NOT checked (record one with --benchmark-save=baseline)"
+
+
+@pytest.fixture(autouse=True)
+def seed():
+    random.seed(SEED)
+
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.quit()
+
+
+@pytest.fixture
+def gui():
+    gui = GUI(SCREEN_WIDTH, SCREEN_HEIGHT)
+    yield gui
+    gui.quit()
+
+
+@pytest.fixture
+def offscreen_gui():
+    gui = OffscreenGUI(SCREEN_WIDTH, SCREEN_HEIGHT)
+    yield gui
+    gui.quit()
+
+
+@pytest.fixture
+def boat():
+    return Boat(
+        length=C.Boat.LENGTH,
+        width=C.Boat.WIDTH,
+        x=-SCREEN_WIDTH / 3,
+        y=0,
+        orientation=C.Boat.START_ORIENTATION,
+        color="#1f1f1f"
+    )
@@ -0,0 +1,27 @@
+import numpy as np
+from mhseals_learn.sim.env import BoatVecEnv
+
+NUM_ENVS = 256
+STEPS = 100
+
+
+def test_vec_env_step(benchmark):
+    env = BoatVecEnv(NUM_ENVS)
+    actions = np.random.default_rng(0).uniform(-1.0, 1.0, (STEPS, NUM_ENVS, 2))
+
+    # Resetting before every round keeps the number of autoresets, which
+    # rebuild courses, the same from round to round
+    def reset():
+        env.reset(seed=0)
+
+    def run():
+        for action in actions:
+            env.step(action)
+
+    benchmark.pedantic(run, setup=reset, rounds=20, warmup_rounds=2)
+
+
+def test_vec_env_reset(benchmark):
+    env = BoatVecEnv(NUM_ENVS)
+    obs, _ = benchmark(env.reset, seed=0)
+    assert obs.shape == (NUM_ENVS, env.observation_dim)
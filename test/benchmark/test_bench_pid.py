@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from mhseals_learn.lessons.pid.sim_pid import PIDController
+
+ITERATIONS = 1000
+ANGLE = np.pi * 0.12
+
+
+@pytest.fixture
+def controller():
+    return PIDController(look_ahead=70, Kp=20, Ki=1, Kd=5, integral_bound=8)
+
+
+def test_compute(benchmark, controller):
+    errors = np.linspace(-np.pi, np.pi, ITERATIONS)
+
+    def run():
+        for error in errors:
+            controller.compute(error)
+
+    benchmark(run)
+
+
+def test_pure_pursuit(benchmark, controller):
+    positions = np.stack((np.linspace(0, 700, ITERATIONS), np.linspace(-50, 50, ITERATIONS)), axis=1)
+    orientations = np.linspace(0, np.pi, ITERATIONS)
+
+    def run():
+        for position, orientation in zip(positions, orientations):
+            controller.pure_pursuit(ANGLE, position, orientation)
+
+    benchmark(run)
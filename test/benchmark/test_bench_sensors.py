@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from random import Random
+from mhseals_learn.sim.map import Course
+from mhseals_learn.sim.sensors import Lidar, Detector
+
+BOATS = 64
+COURSE_GATES = 50
+
+
+@pytest.fixture
+def scene(boat):
+    course = Course.random(boat, COURSE_GATES, Random(0))
+    rng = np.random.default_rng(0)
+    near = rng.choice(course.buoys, BOATS)
+    poses = np.array([(buoy.x + rng.uniform(-60, 60), buoy.y + rng.uniform(-60, 60), rng.uniform(-np.pi, np.pi)) for buoy in near])
+    return poses, course.grid
+
+
+# Handing every round a freshly seeded sensor makes it draw the same noise
+# and dropout, so each round does the same amount of work
+def test_lidar_scan(benchmark, scene):
+    def setup():
+        return (Lidar(seed=0), *scene), {}
+
+    ranges = benchmark.pedantic(Lidar.scan, setup=setup, rounds=100, warmup_rounds=2)
+    assert ranges.shape == (BOATS, Lidar().rays)
+    assert np.isfinite(ranges).any()
+
+
+def test_detector_detect(benchmark, scene):
+    def setup():
+        return (Detector(seed=0), *scene), {}
+
+    detections = benchmark.pedantic(Detector.detect, setup=setup, rounds=100, warmup_rounds=2)
+    assert detections.visible.any()
@@ -0,0 +1,81 @@
+from random import Random
+from mhseals_learn.sim.boat import Trail
+from mhseals_learn.sim.camera import Camera
+from mhseals_learn.sim.map import Gate, Course
+from mhseals_learn.sim.constants import Constants as C
+
+C.to_px()
+C.to_rad()
+
+MOVE_STEPS = 1000
+EPISODE_STEPS = 300
+EPISODE_DT = 1 / 60
+EPISODE_GATES = 10
+COURSE_GATES = 200
+
+
+def test_boat_move(benchmark, boat):
+    boat.set_linear_velocity(5 * C.Conversions.METERS2PX)
+    boat.set_angular_velocity(C.Boat.APS_MAX)
+
+    def run():
+        for _ in range(MOVE_STEPS):
+            boat.move()
+
+    benchmark(run)
+
+
+def test_gate_random(benchmark, boat):
+    gate = benchmark(Gate.random, boat)
+    assert len(gate.buoys) == 4
+
+
+def run_episode(benchmark, gui, boat):
+    course = Course.random(boat, EPISODE_GATES, Random(0))
+    camera = Camera(gui.width, gui.height, target=boat)
+    start = (boat.x, boat.y, boat.orientation)
+    trail = None
+
+    # Every round starts from the same pose with an empty trail and the same
+    # command, so each one draws the same frames
+    def reset():
+        nonlocal trail
+        boat.x, boat.y, boat.orientation = start
+        boat.set_linear_velocity(5 * C.Conversions.METERS2PX)
+        boat.set_angular_velocity(C.Boat.APS_MAX / 4)
+        trail = Trail()
+
+    # Mirrors BoatControl.timer_callback without the ROS node
+    def run():
+        for _ in range(EPISODE_STEPS):
+            gui.get_events()
+            boat.move(EPISODE_DT)
+            trail.append(boat.x, boat.y)
+
+            gui.clear("#b2d8d8")
+            camera.update()
+
+            course.draw(gui.screen, camera)
+            trail.draw(gui.screen, camera)
+            boat.draw(gui.screen, camera)
+            gui.update()
+
+    benchmark.pedantic(run, setup=reset, rounds=15, warmup_rounds=2)
+
+
+def test_episode(benchmark, gui, boat):
+    run_episode(benchmark, gui, boat)
+
+
+def test_episode_offscreen(benchmark, offscreen_gui, boat):
+    run_episode(benchmark, offscreen_gui, boat)
+    assert offscreen_gui.frame().any()
+
+
+def test_course_draw_culled(benchmark, screen, boat):
+    course = Course.random(boat, COURSE_GATES)
+    camera = Camera(*screen.get_size(), target=boat)
+    camera.update()
+
+    benchmark(course.draw, screen, camera)
+    assert len(course.visible_buoys(camera)) < len(course.buoys)
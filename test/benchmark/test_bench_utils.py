@@ -0,0 +1,24 @@
+from mhseals_learn.sim.gui import Drawable
+from mhseals_learn.sim.utils import generate_rectangle, call_safely
+
+
+class Point(Drawable):
+    def draw(self, screen):
+        pass
+
+
+def test_generate_rectangle(benchmark):
+    points = benchmark(generate_rectangle, 10.0, -5.0, 0.3, 35.0, 17.5)
+    assert len(points) == 4
+
+
+def test_generate_rectangle_translated(benchmark, screen):
+    translate = Point().translate_draw_point
+    points = benchmark(generate_rectangle, 10.0, -5.0, 0.3, 35.0, 17.5, translate, screen)
+    assert len(points) == 4
+
+
+def test_call_safely(benchmark, screen):
+    translate = Point().translate_draw_point
+    point = benchmark(call_safely, translate, (1.0, 2.0), screen, unused=True)
+    assert point == (1.0 + screen.get_width() / 2, screen.get_height() / 2 - 2.0)
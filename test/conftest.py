@@ -0,0 +1,3 @@
+# The benchmarks take a while and need pytest-benchmark, so they only run when
+# test/benchmark is targeted directly and its own pytest.ini applies
+collect_ignore = ["benchmark"]
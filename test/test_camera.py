@@ -0,0 +1,94 @@
+import numpy as np
+import pygame
+import pytest
+from random import Random
+from mhseals_learn.sim.boat import Boat, Trail
+from mhseals_learn.sim.camera import Camera
+from mhseals_learn.sim.map import Course
+from mhseals_learn.sim.spatial import SpatialGrid
+from mhseals_learn.sim.constants import Constants as C
+
+C.to_px()
+C.to_rad()
+
+WIDTH = 300
+HEIGHT = 200
+VIEWS = [(1, 0, 0), (0.1, 40, -25), (0.3, 700, 300), (2.5, -150, 80)]
+
+
+def pixels(screen: pygame.Surface) -> np.ndarray:
+    return pygame.surfarray.array3d(screen)
+
+
+def test_default_camera_matches_translate_draw_point():
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    camera = Camera(WIDTH, HEIGHT)
+    for point in np.random.default_rng(0).uniform(-500, 500, (50, 2)):
+        assert camera.to_screen(point) == pytest.approx(Trail().translate_draw_point(point, screen))
+
+
+def test_view_maps_to_screen_corners():
+    boat = Boat(C.Boat.LENGTH, C.Boat.WIDTH, x=120, y=-40)
+    camera = Camera(WIDTH, HEIGHT, zoom=2.5, target=boat)
+    camera.pan(30, -10)
+    camera.update()
+
+    x_min, y_min, x_max, y_max = camera.view
+    assert camera.to_screen((x_min, y_max)) == pytest.approx((0, 0))
+    assert camera.to_screen((x_max, y_min)) == pytest.approx((WIDTH, HEIGHT))
+
+    camera.reset_pan()
+    camera.update()
+    assert camera.to_screen((boat.x, boat.y)) == pytest.approx((WIDTH / 2, HEIGHT / 2))
+
+
+@pytest.mark.parametrize("cell_size", [7.0, 50.0])
+def test_grid_query_matches_brute_force(cell_size):
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-500, 500, (2000, 2))
+    # Some points right on cell edges
+    points[:100] = np.round(points[:100] / cell_size) * cell_size
+    grid = SpatialGrid(cell_size)
+    for i, (x, y) in enumerate(points):
+        grid.insert(i, x, y)
+
+    # Small rectangles walk the covered cells, huge ones the occupied cells
+    for size in (3, 40, 300, 5000):
+        for _ in range(20):
+            x_min, y_min = rng.uniform(-600, 600, 2)
+            x_max, y_max = x_min + size * rng.uniform(0.5, 1), y_min + size * rng.uniform(0.5, 1)
+            got = sorted(item for _, _, item in grid.query(x_min, y_min, x_max, y_max))
+            inside = (points[:, 0] >= x_min) & (points[:, 0] <= x_max) & (points[:, 1] >= y_min) & (points[:, 1] <= y_max)
+            assert got == np.flatnonzero(inside).tolist()
+
+
+@pytest.mark.parametrize("zoom", [0.3, 1, 2.5])
+def test_culled_course_draws_same_pixels(zoom):
+    course = Course.random(Boat(C.Boat.LENGTH, C.Boat.WIDTH), 20, Random(0))
+    for buoy in course.buoys[::7]:
+        # Put the buoy's center just outside the left edge of the view
+        camera = Camera(WIDTH, HEIGHT, buoy.x + WIDTH / 2 / zoom + 0.5 / zoom, buoy.y, zoom)
+        culled, full = pygame.Surface((WIDTH, HEIGHT)), pygame.Surface((WIDTH, HEIGHT))
+
+        course.draw(culled, camera)
+        for other in course.buoys:
+            other.draw(full, camera)
+        np.testing.assert_array_equal(pixels(culled), pixels(full))
+        assert pixels(full).any()
+
+
+@pytest.mark.parametrize("zoom, x, y", VIEWS)
+def test_culled_trail_draws_same_pixels(zoom, x, y):
+    trail = Trail(spacing=0)
+    for point in np.random.default_rng(0).uniform(-2000, 2000, (20000, 2)):
+        trail.append(*point)
+    camera = Camera(WIDTH, HEIGHT, x, y, zoom)
+    culled, full = pygame.Surface((WIDTH, HEIGHT)), pygame.Surface((WIDTH, HEIGHT))
+
+    trail.draw(culled, camera)
+    radius = max(1, C.Trail.RADIUS * camera.scale)
+    for bucket in trail.grid.cells.values():
+        for point in bucket:
+            pygame.draw.circle(full, pygame.Color(trail.color), camera.to_screen(point[:2]), radius)
+    np.testing.assert_array_equal(pixels(culled), pixels(full))
+    assert pixels(full).any()
@@ -0,0 +1,212 @@
+import numpy as np
+import pytest
+from mhseals_learn.sim.env import AutoresetMode, BoatVecEnv, SubprocVecEnv
+from mhseals_learn.sim.sensors import Lidar
+from mhseals_learn.sim.constants import Constants as C
+
+C.to_px()
+C.to_rad()
+
+FORWARD = np.array([1.0, 0.0])
+STOP = np.array([0.0, 0.0])
+
+
+def place_before_exit(env: BoatVecEnv, i: int, gate: int):
+    # Put boat i on the gate's center line, one step short of its exit line
+    env.next_gate[i] = gate
+    direction = np.array([np.cos(env.orientations[i, gate]), np.sin(env.orientations[i, gate])])
+    env.pos[i] = env.centers[i, gate] + (env.half_heights[i, gate] - 5) * direction
+    env.theta[i] = env.orientations[i, gate]
+    env.target_dist = env._target_distance()
+
+
+def test_reset_is_seeded():
+    env = BoatVecEnv(4)
+    first, _ = env.reset(seed=7)
+    second, _ = env.reset(seed=7)
+    np.testing.assert_array_equal(first, second)
+    assert not np.array_equal(first, env.reset(seed=8)[0])
+
+
+def test_reset_accepts_seed_per_env():
+    env = BoatVecEnv(3)
+    by_offset, _ = env.reset(seed=5)
+    by_list, _ = env.reset(seed=[5, 6, 7])
+    np.testing.assert_array_equal(by_offset, by_list)
+
+    swapped, _ = env.reset(seed=[6, 5, 7])
+    np.testing.assert_array_equal(swapped, by_list[[1, 0, 2]])
+    with pytest.raises(ValueError):
+        env.reset(seed=[1, 2])
+
+    sharded = SubprocVecEnv(3, num_workers=2)
+    try:
+        np.testing.assert_array_equal(sharded.reset(seed=[6, 5, 7])[0], swapped)
+    finally:
+        sharded.close()
+
+
+def test_gate_pass_is_rewarded():
+    env = BoatVecEnv(2, autoreset_mode=AutoresetMode.DISABLED)
+    env.reset(seed=0)
+    place_before_exit(env, 0, 0)
+
+    _, rewards, terminated, _, infos = env.step(np.stack((FORWARD, STOP)))
+    assert rewards[0] == pytest.approx(C.Env.GATE_REWARD, abs=0.01)
+    assert infos["gates_passed"].tolist() == [1, 0]
+    assert not terminated.any()
+
+
+def test_last_gate_ends_episode():
+    env = BoatVecEnv(1, autoreset_mode=AutoresetMode.DISABLED)
+    env.reset(seed=0)
+    place_before_exit(env, 0, env.gates - 1)
+
+    _, _, terminated, truncated, infos = env.step(FORWARD[None])
+    assert terminated[0] and not truncated[0]
+    assert infos["is_success"][0] and not infos["collision"][0]
+
+
+def test_collision_terminates():
+    env = BoatVecEnv(2, autoreset_mode=AutoresetMode.DISABLED)
+    env.reset(seed=0)
+    env.pos[0] = env.buoys[0, 0, 0]
+    env.target_dist = env._target_distance()
+
+    _, rewards, terminated, _, infos = env.step(np.stack((STOP, STOP)))
+    assert terminated.tolist() == [True, False]
+    assert infos["collision"].tolist() == [True, False]
+    assert rewards[0] == pytest.approx(C.Env.COLLISION_REWARD)
+
+
+def test_truncated_at_max_steps():
+    env = BoatVecEnv(3, max_steps=3, autoreset_mode=AutoresetMode.DISABLED)
+    env.reset(seed=0)
+    for _ in range(2):
+        _, _, terminated, truncated, _ = env.step(np.zeros((3, 2)))
+        assert not truncated.any()
+
+    _, _, terminated, truncated, _ = env.step(np.zeros((3, 2)))
+    assert truncated.all() and not terminated.any()
+
+
+def test_next_step_autoreset_resets_on_following_step():
+    env = BoatVecEnv(2, max_steps=2)
+    env.reset(seed=0)
+    env.step(np.zeros((2, 2)))
+    env.pos[1] = env.buoys[1, 0, 0]
+
+    _, _, terminated, truncated, infos = env.step(np.zeros((2, 2)))
+    assert terminated.tolist() == [False, True] and truncated.tolist() == [True, False]
+    assert "final_obs" not in infos
+
+    # The finished episodes start over, ignoring the action and reporting nothing
+    obs, rewards, terminated, truncated, infos = env.step(np.ones((2, 2)))
+    np.testing.assert_array_equal(obs, env._observe())
+    assert not obs[:, -2:].any()
+    assert not rewards.any() and not terminated.any() and not truncated.any()
+    assert not infos["_gates_passed"].any() and not infos["collision"].any()
+    assert (env.steps == 0).all()
+
+    _, _, _, _, infos = env.step(np.ones((2, 2)))
+    assert infos["_gates_passed"].all() and (env.steps == 1).all()
+
+
+def test_gymnasium_wrappers_accept_default_env():
+    wrappers = pytest.importorskip("gymnasium.wrappers.vector")
+    env = wrappers.NormalizeObservation(BoatVecEnv(4, max_steps=3))
+    env.reset(seed=0)
+    for _ in range(5):
+        obs, *_ = env.step(np.zeros((4, 2)))
+    assert obs.shape == (4, env.unwrapped.observation_dim)
+
+
+def test_same_step_autoreset_returns_final_obs():
+    env = BoatVecEnv(3, max_steps=2, autoreset_mode=AutoresetMode.SAME_STEP)
+    env.reset(seed=0)
+    env.step(np.zeros((3, 2)))
+    env.steps[2] = 0
+    env.pos[1] = env.buoys[1, 0, 0]
+    before = env._observe()
+
+    obs, _, terminated, truncated, infos = env.step(np.zeros((3, 2)))
+    assert terminated.tolist() == [False, True, False] and truncated.tolist() == [True, False, False]
+
+    # Gymnasium's layout: an object array of final observations, None where
+    # the episode goes on, and the infos they finished with in final_info
+    assert infos["final_obs"].dtype == object and infos["final_obs"][2] is None
+    assert infos["_final_obs"].tolist() == [True, True, False]
+    np.testing.assert_allclose(infos["final_obs"][0], before[0])
+    assert not np.allclose(infos["final_obs"][1], obs[1])
+    assert infos["final_info"]["collision"].tolist() == [False, True, False]
+    assert infos["final_info"]["_collision"].tolist() == [True, True, False]
+    assert infos["_final_info"].tolist() == [True, True, False]
+    assert infos["_collision"].tolist() == [False, False, True]
+
+    assert env.steps.tolist() == [0, 0, 1] and (env.next_gate == 0).all()
+    np.testing.assert_array_equal(obs, env._observe())
+
+
+def assert_infos_equal(expected: dict, got: dict):
+    assert expected.keys() == got.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_infos_equal(value, got[key])
+        elif value.dtype == object:
+            assert [item is None for item in value] == [item is None for item in got[key]]
+            for a, b in zip(value, got[key]):
+                if a is not None:
+                    np.testing.assert_array_equal(a, b)
+        else:
+            np.testing.assert_array_equal(value, got[key])
+
+
+@pytest.mark.parametrize("mode", [AutoresetMode.NEXT_STEP, AutoresetMode.SAME_STEP])
+def test_subproc_matches_single_process(mode):
+    single = BoatVecEnv(6, max_steps=10, autoreset_mode=mode)
+    sharded = SubprocVecEnv(6, num_workers=3, max_steps=10, autoreset_mode=mode)
+    try:
+        np.testing.assert_array_equal(single.reset(seed=3)[0], sharded.reset(seed=3)[0])
+        actions = np.random.default_rng(0).uniform(-1.0, 1.0, (25, 6, 2))
+        for action in actions:
+            expected, got = single.step(action), sharded.step(action)
+            for a, b in zip(expected[:4], got[:4]):
+                np.testing.assert_array_equal(a, b)
+            assert_infos_equal(expected[4], got[4])
+    finally:
+        sharded.close()
+
+
+def test_subproc_fills_infos_missing_from_a_shard():
+    shards = [BoatVecEnv(2, autoreset_mode=AutoresetMode.SAME_STEP) for _ in range(2)]
+    for shard in shards:
+        shard.reset(seed=0)
+    shards[0].pos[1] = shards[0].buoys[1, 0, 0]
+
+    sharded = SubprocVecEnv(4, num_workers=2, autoreset_mode=AutoresetMode.SAME_STEP)
+    try:
+        infos = sharded._merge_infos(tuple(shard.step(np.zeros((2, 2)))[4] for shard in shards))
+    finally:
+        sharded.close()
+
+    assert infos["_final_obs"].tolist() == [False, True, False, False]
+    assert [obs is None for obs in infos["final_obs"]] == [True, False, True, True]
+    assert infos["final_info"]["collision"].tolist() == [False, True, False, False]
+    assert infos["final_info"]["_collision"].tolist() == [False, True, False, False]
+    assert infos["_collision"].tolist() == [True, False, True, True]
+
+
+def test_lidar_noise_is_seeded_per_env():
+    env = BoatVecEnv(4, lidar=Lidar(rays=90))
+    first, _ = env.reset(seed=1)
+    second, _ = env.reset(seed=1)
+    np.testing.assert_array_equal(first, second)
+
+    sharded = SubprocVecEnv(4, num_workers=2, lidar=Lidar(rays=90))
+    try:
+        np.testing.assert_array_equal(sharded.reset(seed=1)[0], first)
+        actions = np.random.default_rng(0).uniform(-1.0, 1.0, (10, 4, 2))
+        for action in actions:
+            np.testing.assert_array_equal(env.step(action)[0], sharded.step(action)[0])
+    finally:
+        sharded.close()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from mhseals_learn.sim.map import Gate, Course
+from mhseals_learn.sim.constants import Constants as C
+
+C.to_px()
+C.to_rad()
+
+R = C.Buoy.RADIUS
+
+
+@pytest.fixture
+def gate():
+    # Pointing up the y axis, so the exit line runs across y = 100 for |x| < 50
+    return Gate(0, 0, np.pi / 2, 100, 200)
+
+
+@pytest.mark.parametrize("start, end, crossed", [
+    ((0, 90), (0, 110), True),
+    ((40, 99), (-40, 101), True),
+    ((0, 100), (0, 101), True),
+    ((0, 110), (0, 90), False),
+    ((60, 90), (60, 110), False),
+    ((0, -110), (0, -90), False),
+    ((0, 0), (0, 50), False),
+    ((0, 110), (0, 130), False),
+])
+def test_gate_crossed_only_out_through_exit(gate, start, end, crossed):
+    assert gate.crossed(start, end) == crossed
+
+
+def test_gate_exit_is_crossed_when_rotated():
+    gate = Gate(10, -20, np.radians(30), 80, 120)
+    direction = np.array([np.cos(gate.orientation), np.sin(gate.orientation)])
+    exit = np.array(gate.exit)
+    assert gate.crossed(exit - direction, exit + direction)
+    assert not gate.crossed(exit + direction, exit - direction)
+
+
+def test_clearance_is_distance_to_nearest_buoy_edge(gate):
+    course = Course([gate, Gate(0, 400, np.pi / 2, 100, 200)])
+    buoy = course.buoys[0]
+    assert course.clearance(buoy.x, buoy.y) == pytest.approx(-R)
+
+    points = np.random.default_rng(0).uniform(-300, 600, (50, 2))
+    for x, y in points:
+        expected = min(np.hypot(b.x - x, b.y - y) for b in course.buoys) - R
+        assert course.clearance(x, y) == pytest.approx(expected)
+
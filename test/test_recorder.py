@@ -0,0 +1,158 @@
+import os
+
+# Must be set before pygame is imported so no window is ever opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import sys  # noqa: E402
+import time  # noqa: E402
+import threading  # noqa: E402
+import subprocess  # noqa: E402
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+from mhseals_learn.sim.gui import OffscreenGUI  # noqa: E402
+from mhseals_learn.sim.recorder import FrameWriter, ImageSequenceWriter, PipeWriter  # noqa: E402
+
+WIDTH = 8
+HEIGHT = 6
+TIMEOUT = 5
+
+
+def frames(count: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (count, HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+
+def exits(code: int) -> list:
+    # An encoder that reads nothing and dies straight away
+    return [sys.executable, "-c", f"import sys; sys.exit({code})"]
+
+
+class BlockingWriter(FrameWriter):
+    """Holds the first frame until released so the queue can fill up."""
+
+    def __init__(self, **kwargs):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        super().__init__(**kwargs)
+
+    def _write(self, frame):
+        self.started.set()
+        self.release.wait(TIMEOUT)
+
+
+class FailingWriter(FrameWriter):
+    def _write(self, frame):
+        raise ValueError("disk full")
+
+
+@pytest.fixture
+def gui():
+    gui = OffscreenGUI(WIDTH, HEIGHT)
+    yield gui
+    gui.quit()
+
+
+def test_offscreen_frame_is_live_rgb_view(gui):
+    frame = gui.frame()
+    pygame.draw.rect(gui.screen, (255, 0, 0), (2, 1, 3, 2))
+
+    assert frame.shape == (HEIGHT, WIDTH, 3)
+    np.testing.assert_array_equal(frame[1:3, 2:5], np.full((2, 3, 3), (255, 0, 0)))
+    assert not frame[0].any() and not frame[:, :2].any()
+
+    # Still the same memory, nothing is copied out per frame
+    assert np.shares_memory(gui.frame(), gui.buffer)
+    gui.screen.fill((0, 0, 255))
+    np.testing.assert_array_equal(frame[0, 0], (0, 0, 255))
+
+
+def test_image_sequence_writes_numbered_frames(tmp_path):
+    expected = frames(5)
+    buffer = np.zeros_like(expected[0])
+    with ImageSequenceWriter(str(tmp_path)) as writer:
+        for frame in expected:
+            # Reusing one buffer like OffscreenGUI does, so write has to copy
+            buffer[:] = frame
+            writer.write(buffer)
+
+    assert sorted(os.listdir(tmp_path)) == [f"frame_{i:06d}.png" for i in range(5)]
+    for i, frame in enumerate(expected):
+        surface = pygame.image.load(str(tmp_path / f"frame_{i:06d}.png"))
+        np.testing.assert_array_equal(pygame.surfarray.array3d(surface).transpose(1, 0, 2), frame)
+
+
+def test_pipe_writer_streams_raw_rgb(tmp_path):
+    path = tmp_path / "out.raw"
+    expected = frames(3)
+    command = [sys.executable, "-c", f"import sys; open({str(path)!r}, 'wb').write(sys.stdin.buffer.read())"]
+    with PipeWriter(command) as writer:
+        for frame in expected:
+            writer.write(frame)
+
+    assert path.read_bytes() == expected.tobytes()
+    assert writer.process.returncode == 0
+
+
+def test_drop_frames_counts_drops():
+    writer = BlockingWriter(max_queue=2, drop_frames=True)
+    frame = frames(1)[0]
+    writer.write(frame)
+    assert writer.started.wait(TIMEOUT)
+
+    # One frame is being written, two fit in the queue, the rest are dropped
+    for _ in range(5):
+        writer.write(frame)
+    writer.release.set()
+    writer.close()
+
+    assert writer.dropped == 3
+    assert writer.count == 3
+
+
+def test_writer_error_surfaces_from_write_and_close():
+    writer = FailingWriter()
+    frame = frames(1)[0]
+    writer.write(frame)
+    deadline = time.monotonic() + TIMEOUT
+    while writer.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(RuntimeError) as write_error:
+        writer.write(frame)
+    assert isinstance(write_error.value.__cause__, ValueError)
+
+    with pytest.raises(RuntimeError) as close_error:
+        writer.close()
+    assert isinstance(close_error.value.__cause__, ValueError)
+
+
+def test_dead_encoder_is_reaped_and_reported():
+    writer = PipeWriter(exits(3))
+    writer.process.wait(TIMEOUT)
+    writer.write(frames(1)[0])
+
+    with pytest.raises(RuntimeError) as error:
+        writer.close()
+    assert isinstance(error.value.__cause__, subprocess.CalledProcessError)
+    assert error.value.__cause__.returncode == 3
+    assert writer.process.returncode == 3
+
+
+def test_quit_closes_every_writer_when_one_fails(tmp_path):
+    # Frames bigger than the pipe's buffer so writes to the dead encoder fail
+    encoder = PipeWriter(exits(1))
+    encoder.process.wait(TIMEOUT)
+    gui = OffscreenGUI(64, 48)
+    gui.record(encoder)
+    gui.record(ImageSequenceWriter(str(tmp_path)))
+
+    for _ in range(30):
+        try:
+            gui.update()
+        except RuntimeError:
+            pass
+
+    with pytest.raises(RuntimeError) as error:
+        gui.quit()
+    assert isinstance(error.value.__cause__, subprocess.CalledProcessError)
+    assert len(os.listdir(tmp_path)) == 30
@@ -0,0 +1,72 @@
+import json
+import threading
+import time
+import pytest
+from mhseals_learn.sim import regression
+from mhseals_learn.sim.regression import ROS_DOMAIN_ID_MAX, format_result, run_all
+
+
+def result(seed: int, passed: bool=True, **kwargs) -> dict:
+    return dict({"seed": seed, "outcome": "passed" if passed else "collision", "passed": passed, "time": 12.34,
+                 "gates_passed": 3, "gates": 3, "min_clearance": 0.5}, **kwargs)
+
+
+def test_format_result():
+    assert format_result(result(7)) == "seed     7  passed      time   12.3s  gates 3/3  clearance  0.50m"
+    missing = result(8, False, outcome="no_result", time=None, gates_passed=0, min_clearance=None)
+    assert format_result(missing) == "seed     8  no_result   time       -  gates 0/3  clearance      -"
+
+
+def test_run_all_recycles_domain_ids(monkeypatch):
+    lock = threading.Lock()
+    active = set()
+    used = []
+
+    def run_scenario(seed, domain_id, **kwargs):
+        with lock:
+            assert domain_id not in active
+            active.add(domain_id)
+            used.append(domain_id)
+        time.sleep(0.01)
+        with lock:
+            active.remove(domain_id)
+        return result(seed, domain_id=domain_id, **kwargs)
+
+    monkeypatch.setattr(regression, "run_scenario", run_scenario)
+    results = run_all(list(range(20)), 3, 10, gates=3)
+
+    assert [r["seed"] for r in results] == list(range(20))
+    assert set(used) == {10, 11, 12}
+    assert all(r["gates"] == 3 for r in results)
+
+
+@pytest.mark.parametrize("argv", [
+    ["--domain-base", "-1"],
+    ["--domain-base", str(ROS_DOMAIN_ID_MAX), "--jobs", "2"],
+])
+def test_main_rejects_domain_ids_out_of_range(monkeypatch, argv):
+    monkeypatch.setattr(regression, "run_all", lambda *args, **kwargs: pytest.fail("should not run"))
+    with pytest.raises(SystemExit) as exit:
+        regression.main(["controller", "--scenarios", "4"] + argv)
+    assert exit.value.code == 2
+
+
+def test_main_caps_jobs_and_reports(monkeypatch, tmp_path):
+    calls = []
+
+    def run_all(seeds, jobs, domain_base, **kwargs):
+        calls.append((seeds, jobs, domain_base))
+        return [result(seed, passed=seed != 6) for seed in seeds]
+
+    monkeypatch.setattr(regression, "run_all", run_all)
+    output = tmp_path / "report.json"
+    # Only two scenarios, so only two domain IDs are needed from the top of the range
+    argv = ["controller", "--scenarios", "2", "--seed-start", "5", "--jobs", "8",
+            "--domain-base", str(ROS_DOMAIN_ID_MAX - 1), "--output", str(output)]
+    with pytest.raises(SystemExit) as exit:
+        regression.main(argv)
+
+    assert calls == [([5, 6], 2, ROS_DOMAIN_ID_MAX - 1)]
+    assert exit.value.code == 1
+    report = json.loads(output.read_text())
+    assert (report["scenarios"], report["passed"], report["failed"]) == (2, 1, 1)
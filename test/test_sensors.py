@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from random import Random
+from mhseals_learn.sim.boat import Boat
+from mhseals_learn.sim.map import Course
+from mhseals_learn.sim.sensors import Lidar, Detector, gather_buoys, cast_rays
+from mhseals_learn.sim.constants import Constants as C
+
+C.to_px()
+C.to_rad()
+
+M = C.Conversions.METERS2PX
+
+
+@pytest.fixture
+def course():
+    boat = Boat(C.Boat.LENGTH, C.Boat.WIDTH)
+    return Course.random(boat, 10, Random(0))
+
+
+def brute_force(lidar: Lidar, poses: np.ndarray, grid) -> np.ndarray:
+    # Every ray against every nearby buoy
+    centers, valid, _ = gather_buoys(grid, poses[:, :2], lidar.max_range + C.Buoy.RADIUS)
+    ranges, _ = cast_rays(poses[:, :2], poses[:, 2:3] + lidar.offsets, centers, valid, C.Buoy.RADIUS)
+    ranges[ranges > lidar.max_range] = np.inf
+    return ranges * C.Conversions.PX2METERS
+
+
+@pytest.mark.parametrize("fov, rays", [(360, 360), (360, 1000), (359, 359), (270, 541), (90, 91), (180, 7)])
+def test_lidar_matches_brute_force(course, fov, rays):
+    rng = np.random.default_rng(0)
+    near = rng.choice(course.buoys, 200)
+    # Mostly close enough that buoys span wide windows, some right next to one
+    offsets = rng.uniform(-3 * M, 3 * M, (len(near), 2))
+    offsets[::4] = rng.uniform(-0.6 * M, 0.6 * M, (len(near[::4]), 2))
+    poses = np.column_stack((
+        [buoy.x for buoy in near] + offsets[:, 0],
+        [buoy.y for buoy in near] + offsets[:, 1],
+        rng.uniform(-np.pi, np.pi, len(near)),
+    ))
+
+    lidar = Lidar(rays=rays, fov=np.radians(fov), range_noise=0, dropout=0)
+    expected = brute_force(lidar, poses, course.grid)
+    np.testing.assert_allclose(lidar.scan(poses, course.grid), expected)
+    assert np.isfinite(expected).any()
+
+
+def test_lidar_sees_buoy_behind_across_seam(course):
+    # A buoy close behind, just left of straight back, spans the seam of a
+    # 270 degree scan so both its first and last rays should see it
+    buoy = course.buoys[0]
+    bearing = np.radians(175)
+    poses = np.array([(buoy.x - 0.22 * M * np.cos(bearing), buoy.y - 0.22 * M * np.sin(bearing), 0.0)])
+    lidar = Lidar(rays=541, fov=np.radians(270), range_noise=0, dropout=0)
+
+    ranges = lidar.scan(poses, course.grid)
+    np.testing.assert_allclose(ranges, brute_force(lidar, poses, course.grid))
+    assert np.isfinite(ranges[0, :5]).all() and np.isfinite(ranges[0, -5:]).all()
+
+
+def test_detector_occlusion(course):
+    buoy = course.buoys[0]
+    # Looking along the line through two buoys of the same gate side, only the nearer one is visible
+    other = course.buoys[1]
+    direction = np.array([other.x - buoy.x, other.y - buoy.y])
+    direction /= np.linalg.norm(direction)
+    x, y = np.array([buoy.x, buoy.y]) - direction * 2 * M
+    pose = np.array([(x, y, np.arctan2(direction[1], direction[0]))])
+
+    detections = Detector(range_noise=0, bearing_noise=0, dropout=0).detect(pose, course.grid)
+    visible = [found for found, seen in zip(detections.buoys[0], detections.visible[0]) if seen]
+    assert buoy in visible and other not in visible